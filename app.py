@@ -7,6 +7,9 @@ import streamlit as st
 import seaborn as sns
 from datetime import datetime
 
+from duty_reader import NAME_HEADERS, read_duty_file
+from duty_whatif import DutyLedger
+
 
 # ----------------- MASTER FACULTY LIST -----------------
 full_faculty_list = [
@@ -162,11 +165,21 @@ file_path = os.path.join(DATA_FOLDER, selected_file)
 
 st.success(f"📄 Loading: {selected_file}")
 
-# Read selected file
-if selected_file.lower().endswith(".csv"):
-    df = pd.read_csv(file_path)
-else:
-    df = pd.read_excel(file_path)
+@st.cache_data
+def load_duty_file(path, mtime):
+    """Read every sheet once; cached per file version across reruns."""
+    return read_duty_file(path)
+
+# Read selected file (header row, name column and duty columns auto-detected)
+df, layouts = load_duty_file(file_path, os.path.getmtime(file_path))
+df = df.copy()
+
+if not layouts:
+    st.error("No duty table found in this file (need a name column and date/session columns).")
+    st.stop()
+
+st.caption("Detected layout per sheet")
+st.dataframe(pd.DataFrame(layouts))
 
 
 
@@ -182,25 +195,13 @@ df.columns = [str(c).strip() for c in df.columns]
 st.subheader("Raw Uploaded File (First 5 rows)")
 st.dataframe(df.head())
 
-# ----------------- DETECT NAME COLUMN -----------------
-possible_name_cols = [
-    "Name", "NAME", "Faculty", "Faculty Name",
-    "Invigilator", "Invigilator Name"
-]
-
-name_col = None
-for c in df.columns:
-    if str(c).strip() in possible_name_cols:
-        name_col = c
-        break
-
-if name_col is None:
-    name_col = df.columns[0]
-    st.info(f"No standard 'Name' column found. Using first column as Name: **{name_col}**")
-
-# Rename to RawName
-if name_col != "RawName":
-    df = df.rename(columns={name_col: "RawName"})
+# ----------------- NAME COLUMN -----------------
+for layout in layouts:
+    if layout["NameColumn"].lower() not in NAME_HEADERS:
+        st.info(
+            f"No standard 'Name' column found in sheet **{layout['Sheet']}**. "
+            f"Using **{layout['NameColumn']}** as Name (most text values)."
+        )
 
 df["RawName"] = df["RawName"].astype(str).str.strip()
 
@@ -376,6 +377,91 @@ summary_df = pd.DataFrame({
 })
 
 st.dataframe(summary_df)
+
+# ----------------- WHAT-IF REASSIGNMENT -----------------
+st.subheader("What-if Reassignment")
+st.caption("Move a session from one faculty to another. Figures update from running counters; the duty file is not changed.")
+
+# Session-level duties of mapped faculty
+on_duty_long = mapped_df[["MappedName"] + duty_cols].melt(
+    id_vars="MappedName", var_name="Session", value_name="Duty"
+)
+on_duty_long = on_duty_long[on_duty_long["Duty"] > 0]
+assignments = [
+    (name, selected_file, session)
+    for name, session in zip(on_duty_long["MappedName"], on_duty_long["Session"])
+]
+
+data_key = (selected_file, os.path.getmtime(file_path))
+if st.session_state.get("whatif_key") != data_key:
+    st.session_state["whatif_key"] = data_key
+    st.session_state["whatif"] = DutyLedger(full_faculty_list, assignments)
+
+
+@st.fragment
+def whatif_panel():
+    """Reruns on its own, so a move does not re-read the file or redraw the reports above."""
+    ledger = st.session_state["whatif"]
+    if not ledger.sessions():
+        st.info("No duty sessions to reassign.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    session = c1.selectbox("Session", [ses for _, ses in ledger.sessions(selected_file)], key="wi_ses")
+    on_duty = ledger.on_duty(selected_file, session)
+    src = c2.selectbox("From", on_duty, key="wi_src")
+    dst = c3.selectbox("To", [n for n in ledger.roster if n not in on_duty], key="wi_dst")
+
+    b1, b2, b3 = st.columns(3)
+    if b1.button("Apply move", disabled=src is None or dst is None):
+        try:
+            ledger.move(selected_file, session, src, dst)
+            st.rerun(scope="fragment")
+        except ValueError as e:
+            st.error(str(e))
+    if b2.button("Undo last move", disabled=not ledger.history):
+        ledger.undo()
+        st.rerun(scope="fragment")
+    if b3.button("Reset all moves", disabled=not ledger.history):
+        st.session_state["whatif"] = DutyLedger(full_faculty_list, assignments)
+        st.rerun(scope="fragment")
+
+    if not ledger.history:
+        st.info("No moves applied yet.")
+        return
+
+    st.markdown("#### Moves Applied")
+    st.dataframe(pd.DataFrame(
+        [(ses, frm, to) for _, ses, frm, to in ledger.history],
+        columns=["Session", "From", "To"]
+    ))
+
+    st.markdown("#### Changed Duty Counts")
+    st.dataframe(pd.DataFrame(
+        [(name, before, after) for (name, _), (before, after) in ledger.changed_cells().items()],
+        columns=["Name", "Before", "After"]
+    ))
+
+    z, mn, mx = st.columns(3)
+    min_val, min_names = ledger.min_nonzero()
+    max_val, max_names = ledger.max_duty()
+    with z:
+        st.markdown("**ZERO Duties**")
+        st.dataframe(pd.DataFrame({"Name": ledger.zero_duty()}))
+    with mn:
+        st.markdown(f"**Minimum Duty ({min_val})**")
+        st.dataframe(pd.DataFrame({"Name": min_names}))
+    with mx:
+        st.markdown(f"**Maximum Duty ({max_val})**")
+        st.dataframe(pd.DataFrame({"Name": max_names}))
+
+    st.markdown("#### What-if Summary")
+    metrics = ledger.summary()
+    st.dataframe(pd.DataFrame({"Metric": list(metrics), "Value": [str(v) for v in metrics.values()]}))
+
+
+whatif_panel()
+
 # ----------------- COPYRIGHT -----------------
 st.markdown(
     """
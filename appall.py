@@ -5,6 +5,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import streamlit as st
 
+from duty_reader import read_duty_file
+from duty_whatif import DutyLedger
+
 
 # -------------------------------------------------
 # MASTER FACULTY LIST
@@ -121,6 +124,13 @@ if not files:
 st.success(f"Detected {len(files)} files")
 
 summary_all = []
+assignments_all = []
+
+
+@st.cache_data
+def load_duty_file(path, mtime):
+    """Read every sheet once; cached per file version across reruns."""
+    return read_duty_file(path)
 
 
 # -------------------------------------------------
@@ -131,11 +141,12 @@ for filename in files:
 
     path = os.path.join(DATA_FOLDER, filename)
 
-    df = pd.read_excel(path) if filename.endswith((".xlsx",".xls")) else pd.read_csv(path)
-    df.columns = [str(c).strip() for c in df.columns]
+    df, layouts = load_duty_file(path, os.path.getmtime(path))
+    df = df.copy()
+    if not layouts:
+        st.warning(f"No duty table found in {filename}, skipped.")
+        continue
 
-    name_col = df.columns[0]
-    df = df.rename(columns={name_col: "RawName"})
     #df["RawName"] = df["RawName"].astype(str).strip()
     df["RawName"] = df["RawName"].astype(str).str.strip()
 
@@ -155,10 +166,24 @@ for filename in files:
 
     summary_all.append(summary)
 
+    # session-level duties for the what-if ledger
+    on_duty = df.loc[df["MappedName"].notna(), ["MappedName"] + duty_cols].melt(
+        id_vars="MappedName", var_name="Session", value_name="Duty"
+    )
+    on_duty = on_duty[on_duty["Duty"] > 0]
+    assignments_all.extend(
+        (name, filename, session)
+        for name, session in zip(on_duty["MappedName"], on_duty["Session"])
+    )
+
 
 # -------------------------------------------------
 # MERGE ALL SEMESTERS
 # -------------------------------------------------
+if not summary_all:
+    st.error("No duty tables could be read from duty_files/.")
+    st.stop()
+
 final_df = pd.concat(summary_all)
 
 final_total = final_df.groupby("MappedName")["TotalDuty"].sum().reset_index()
@@ -293,6 +318,105 @@ summary_df = pd.DataFrame({
 })
 
 st.dataframe(summary_df, use_container_width=True)
+
+
+# -------------------------------------------------
+# WHAT-IF REASSIGNMENT
+# -------------------------------------------------
+st.header("What-if Reassignment")
+st.caption("Move a session from one faculty to another. Figures update from running counters; the duty files are not changed.")
+
+data_key = tuple(sorted((f, os.path.getmtime(os.path.join(DATA_FOLDER, f))) for f in files))
+if st.session_state.get("whatif_key") != data_key:
+    st.session_state["whatif_key"] = data_key
+    st.session_state["whatif"] = DutyLedger(full_faculty_list, assignments_all)
+
+
+@st.fragment
+def whatif_panel():
+    """Reruns on its own, so a move does not re-read files or redraw the reports above."""
+    ledger = st.session_state["whatif"]
+    if not ledger.sessions():
+        st.info("No duty sessions to reassign.")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    semester = c1.selectbox("Semester", sorted({sem for sem, _ in ledger.sessions()}), key="wi_sem")
+    session = c2.selectbox("Session", [ses for _, ses in ledger.sessions(semester)], key="wi_ses")
+    on_duty = ledger.on_duty(semester, session)
+    src = c3.selectbox("From", on_duty, key="wi_src")
+    dst = c4.selectbox("To", [n for n in ledger.roster if n not in on_duty], key="wi_dst")
+
+    b1, b2, b3 = st.columns(3)
+    if b1.button("Apply move", disabled=src is None or dst is None):
+        try:
+            ledger.move(semester, session, src, dst)
+            st.rerun(scope="fragment")
+        except ValueError as e:
+            st.error(str(e))
+    if b2.button("Undo last move", disabled=not ledger.history):
+        ledger.undo()
+        st.rerun(scope="fragment")
+    if b3.button("Reset all moves", disabled=not ledger.history):
+        st.session_state["whatif"] = DutyLedger(full_faculty_list, assignments_all)
+        st.rerun(scope="fragment")
+
+    if not ledger.history:
+        st.info("No moves applied yet.")
+        return
+
+    st.markdown("#### Moves Applied")
+    st.dataframe(pd.DataFrame(ledger.history, columns=["Semester", "Session", "From", "To"]))
+
+    st.markdown("#### What-if Summary")
+    metrics = ledger.summary()
+    st.dataframe(
+        pd.DataFrame({"Metric": list(metrics), "Value": [str(v) for v in metrics.values()]}),
+        use_container_width=True
+    )
+
+    z, mn, mx = st.columns(3)
+    min_val, min_names = ledger.min_nonzero()
+    max_val, max_names = ledger.max_duty()
+    with z:
+        st.markdown("**ZERO Duties**")
+        st.dataframe(pd.DataFrame({"Name": ledger.zero_duty()}))
+    with mn:
+        st.markdown(f"**Minimum Duty ({min_val})**")
+        st.dataframe(pd.DataFrame({"Name": min_names}))
+    with mx:
+        st.markdown(f"**Maximum Duty ({max_val})**")
+        st.dataframe(pd.DataFrame({"Name": max_names}))
+
+    # Patch only the touched heatmap cells onto the original pivot
+    changed = ledger.changed_cells()
+    st.markdown("#### Changed Heatmap Cells")
+    st.dataframe(pd.DataFrame(
+        [(name, sem, before, after) for (name, sem), (before, after) in changed.items()],
+        columns=["Name", "Semester", "Before", "After"]
+    ))
+
+    whatif_pivot = pivot.copy()
+    for (name, sem), (_, after) in changed.items():
+        whatif_pivot.loc[name, sem] = after
+    whatif_pivot = whatif_pivot.fillna(0).astype(int)
+
+    fig, ax = plt.subplots(figsize=(14, 10))
+    sns.heatmap(
+        whatif_pivot,
+        cmap="YlOrRd",
+        annot=True,
+        fmt="d",
+        linewidths=0.4,
+        linecolor="black",
+        cbar_kws={'label': 'Duty Count'},
+    )
+    ax.set_title("What-if Duty Heatmap", fontsize=18, fontweight='bold')
+    st.pyplot(fig)
+
+
+whatif_panel()
+
 # ----------------- COPYRIGHT -----------------
 st.markdown(
     """
@@ -0,0 +1,271 @@
+import csv
+import io
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+
+# ----------------- HEADER / NAME COLUMN DETECTION -----------------
+
+# Header labels that identify the faculty name column
+possible_name_cols = [
+    "Name", "NAME", "Faculty", "Faculty Name",
+    "Invigilator", "Invigilator Name"
+]
+NAME_HEADERS = {c.strip().lower() for c in possible_name_cols}
+
+# Serial-number columns that precede the name and are never duty sessions
+SERIAL_HEADERS = {"sl", "slno", "sno", "sr", "srno", "serial", "serialno", "#"}
+
+# Rows inspected to locate the header row and name column before parsing
+SAMPLE_ROWS = 25
+
+
+def _is_blank(v) -> bool:
+    if v is None:
+        return True
+    if isinstance(v, float) and pd.isna(v):
+        return True
+    return isinstance(v, str) and v.strip() == ""
+
+
+def _is_number(v) -> bool:
+    if isinstance(v, bool) or _is_blank(v):
+        return False
+    if isinstance(v, (int, float)):
+        return True
+    try:
+        float(str(v).strip())
+        return True
+    except ValueError:
+        return False
+
+
+def _is_text(v) -> bool:
+    """A cell that looks like a person's name rather than a mark or a date."""
+    return (
+        not _is_blank(v)
+        and not _is_number(v)
+        and not isinstance(v, (datetime, date))
+    )
+
+
+def _cell(row, i):
+    return row[i] if i < len(row) else None
+
+
+def _label(v) -> str:
+    return "" if _is_blank(v) else str(v).strip()
+
+
+def _is_serial(label, values) -> bool:
+    """Serial column: labelled like one, or counting 1, 2, 3, ... down the rows."""
+    key = "".join(ch for ch in label.lower() if ch.isalnum() or ch == "#")
+    if key in SERIAL_HEADERS:
+        return True
+    if len(values) < 3 or not all(_is_number(v) for v in values):
+        return False
+    nums = [float(v) for v in values]
+    return all(b - a == 1 for a, b in zip(nums, nums[1:]))
+
+
+def detect_layout(sample):
+    """
+    Work out the sheet layout from the first few rows.
+    Returns (header_idx, data_start, name_idx, duty_cols) where duty_cols is
+    a list of (column_index, column_label), or None if the sheet holds no
+    duty table.
+    """
+    rows = [list(r) for r in sample]
+    if not rows:
+        return None
+
+    # 1. Header row: the first row naming a known name column, otherwise the
+    #    first row with at least two labels and no numeric marks.
+    #    Title rows above it (single merged cell) are skipped.
+    header_idx = None
+    for i, row in enumerate(rows):
+        if any(_label(v).lower() in NAME_HEADERS for v in row):
+            header_idx = i
+            break
+    if header_idx is None:
+        for i, row in enumerate(rows):
+            filled = [v for v in row if not _is_blank(v)]
+            if len(filled) >= 2 and not any(_is_number(v) for v in filled):
+                header_idx = i
+                break
+    if header_idx is None:
+        return None
+
+    header = rows[header_idx]
+    width = max(len(r) for r in rows[header_idx:])
+
+    # 2. Name column: known header label, otherwise the column holding the
+    #    most text values in the sampled data rows.
+    data = rows[header_idx + 1:]
+    name_idx = None
+    for i in range(width):
+        if _label(_cell(header, i)).lower() in NAME_HEADERS:
+            name_idx = i
+            break
+    if name_idx is None:
+        counts = [sum(_is_text(_cell(r, i)) for r in data) for i in range(width)]
+        if not counts or max(counts) == 0:
+            return None
+        name_idx = counts.index(max(counts))
+
+    # 3. Merged two-level headers: a row under the header with labels but no
+    #    name is a sub-header (e.g. date spanning "Morning"/"Evening").
+    labels = [_label(_cell(header, i)) for i in range(width)]
+    header_rows = 1
+    if data:
+        sub = data[0]
+        sub_labels = [_label(_cell(sub, i)) for i in range(width)]
+        if (
+            _is_blank(_cell(sub, name_idx))
+            and any(sub_labels)
+            and not any(_is_number(_cell(sub, i)) for i in range(width))
+        ):
+            header_rows = 2
+            parent = ""
+            for i in range(width):
+                if labels[i]:
+                    parent = labels[i]
+                if i != name_idx and sub_labels[i]:
+                    labels[i] = f"{parent} | {sub_labels[i]}" if parent else sub_labels[i]
+                elif i != name_idx and not labels[i] and parent:
+                    labels[i] = parent
+            data = data[1:]
+
+    # 4. Duty columns: labelled columns whose sampled values are marks/blank.
+    duty_cols = []
+    seen = {}
+    for i in range(width):
+        if i == name_idx or not labels[i]:
+            continue
+        values = [_cell(r, i) for r in data if not _is_blank(_cell(r, name_idx))]
+        if any(_is_text(v) for v in values) or _is_serial(labels[i], values):
+            continue
+        label = labels[i]
+        if label in seen:
+            seen[label] += 1
+            label = f"{label}.{seen[label]}"
+        else:
+            seen[label] = 0
+        duty_cols.append((i, label))
+
+    return header_idx, header_idx + header_rows, name_idx, duty_cols
+
+
+# ----------------- STREAMING SHEET PARSER -----------------
+
+def _parse_rows(rows, sheet_name):
+    """
+    Consume an iterator of row tuples once: sample, detect the layout, then
+    keep only the name and duty-session cells of the remaining rows.
+    """
+    rows = iter(rows)
+    sample = []
+    for row in rows:
+        sample.append(tuple(row))
+        if len(sample) >= SAMPLE_ROWS:
+            break
+
+    layout = detect_layout(sample)
+    if layout is None:
+        return None, None
+    header_idx, data_start, name_idx, duty_cols = layout
+    if not duty_cols:
+        return None, None
+
+    keep = [name_idx] + [i for i, _ in duty_cols]
+    records = []
+
+    def take(row):
+        name = _cell(row, name_idx)
+        if _is_blank(name):
+            return
+        records.append([_cell(row, i) for i in keep])
+
+    for row in sample[data_start:]:
+        take(row)
+    for row in rows:
+        take(row)
+
+    df = pd.DataFrame(records, columns=["RawName"] + [c for _, c in duty_cols])
+    info = {
+        "Sheet": sheet_name,
+        "HeaderRow": header_idx + 1,
+        "NameColumn": _label(_cell(sample[header_idx], name_idx)) or f"Column {name_idx + 1}",
+        "DutyColumns": len(duty_cols),
+        "Rows": len(df),
+    }
+    return df, info
+
+
+def _iter_sheets(source, filename):
+    """Yield (sheet_name, row_iterator) for every sheet in the file."""
+    ext = os.path.splitext(filename)[1].lower()
+
+    if ext == ".csv":
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, newline="", encoding="utf-8-sig") as fh:
+                yield "Sheet1", csv.reader(fh)
+        else:
+            text = source.read()
+            if isinstance(text, bytes):
+                text = text.decode("utf-8-sig")
+            yield "Sheet1", csv.reader(io.StringIO(text))
+        return
+
+    if ext == ".xlsx":
+        # read_only streams rows without building the full cell model
+        import openpyxl
+
+        wb = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        try:
+            for ws in wb.worksheets:
+                yield ws.title, ws.iter_rows(values_only=True)
+        finally:
+            wb.close()
+        return
+
+    # .xls and anything else: let pandas pick the engine, headers unparsed
+    sheets = pd.read_excel(source, sheet_name=None, header=None)
+    for sheet_name, raw in sheets.items():
+        yield str(sheet_name), raw.itertuples(index=False, name=None)
+
+
+def read_duty_file(source, filename=None):
+    """
+    Read every sheet of a duty file into one frame: "RawName" followed by
+    the duty-session columns. Title rows, merged headers and sheets without
+    a duty table are skipped. For multi-sheet workbooks the session columns
+    are prefixed with the sheet name.
+    Returns (df, layouts) where layouts describes what was detected per sheet.
+    """
+    if filename is None:
+        filename = source if isinstance(source, (str, os.PathLike)) else source.name
+    filename = str(filename)
+
+    frames = []
+    layouts = []
+    for sheet_name, rows in _iter_sheets(source, filename):
+        df, info = _parse_rows(rows, sheet_name)
+        if df is None:
+            continue
+        frames.append((sheet_name, df))
+        layouts.append(info)
+
+    if not frames:
+        return pd.DataFrame(columns=["RawName"]), layouts
+
+    if len(frames) == 1:
+        return frames[0][1], layouts
+
+    prefixed = [
+        df.rename(columns={c: f"{sheet} | {c}" for c in df.columns if c != "RawName"})
+        for sheet, df in frames
+    ]
+    return pd.concat(prefixed, ignore_index=True), layouts
@@ -0,0 +1,147 @@
+from bisect import bisect_right, insort
+from collections import Counter, defaultdict
+
+
+# ----------------- WHAT-IF DUTY LEDGER -----------------
+
+class DutyLedger:
+    """
+    Duty loads kept as counters so a single reassignment updates totals,
+    zero/min/max sets, percentages and heatmap cells in O(change) instead
+    of re-running the groupby, merge and pivot.
+
+    assignments: iterable of (name, semester, session) for every duty held.
+    """
+
+    def __init__(self, roster, assignments):
+        self.roster = list(dict.fromkeys(roster))
+        self.loads = dict.fromkeys(self.roster, 0)
+        self.cells = Counter()                  # (name, semester) -> duties
+        self.on_session = defaultdict(Counter)  # (semester, session) -> names
+        self.total = 0
+
+        for name, semester, session in assignments:
+            if name not in self.loads:
+                self.roster.append(name)
+                self.loads[name] = 0
+            self.loads[name] += 1
+            self.cells[(name, semester)] += 1
+            self.on_session[(semester, session)][name] += 1
+            self.total += 1
+
+        # Sorted multiset of loads: load value -> names, plus sorted keys
+        self.by_load = defaultdict(set)
+        for name, load in self.loads.items():
+            self.by_load[load].add(name)
+        self.load_values = sorted(self.by_load)
+
+        self.base_cells = Counter(self.cells)
+        self.history = []
+
+    # ----------------- UPDATES -----------------
+
+    def _shift(self, name, delta):
+        old = self.loads[name]
+        new = old + delta
+        self.loads[name] = new
+
+        self.by_load[old].discard(name)
+        if not self.by_load[old]:
+            del self.by_load[old]
+            self.load_values.remove(old)
+        if new not in self.by_load:
+            insort(self.load_values, new)
+        self.by_load[new].add(name)
+
+    def _apply(self, semester, session, src, dst):
+        names = self.on_session[(semester, session)]
+        names[src] -= 1
+        if names[src] == 0:
+            del names[src]
+        names[dst] += 1
+
+        for name, delta in ((src, -1), (dst, 1)):
+            self._shift(name, delta)
+            self.cells[(name, semester)] += delta
+            if self.cells[(name, semester)] == 0:
+                del self.cells[(name, semester)]
+
+    def move(self, semester, session, src, dst):
+        """Reassign one session from src to dst."""
+        names = self.on_session.get((semester, session), Counter())
+        if names[src] <= 0:
+            raise ValueError(f"{src} has no duty on {session} ({semester}).")
+        if dst not in self.loads:
+            raise ValueError(f"{dst} is not in the faculty list.")
+        if src == dst or names[dst] > 0:
+            raise ValueError(f"{dst} is already on duty on {session} ({semester}).")
+
+        self._apply(semester, session, src, dst)
+        self.history.append((semester, session, src, dst))
+
+    def undo(self):
+        """Revert the most recent move; returns it, or None if there is none."""
+        if not self.history:
+            return None
+        semester, session, src, dst = self.history.pop()
+        self._apply(semester, session, dst, src)
+        return semester, session, src, dst
+
+    # ----------------- QUERIES -----------------
+
+    def sessions(self, semester=None):
+        return sorted(
+            key for key, names in self.on_session.items()
+            if semester is None or key[0] == semester
+        )
+
+    def on_duty(self, semester, session):
+        return sorted(n for n, c in self.on_session.get((semester, session), {}).items() if c > 0)
+
+    def zero_duty(self):
+        return sorted(self.by_load.get(0, ()))
+
+    def min_nonzero(self):
+        """(value, names) for the smallest non-zero load, or (0, [])."""
+        i = bisect_right(self.load_values, 0)
+        if i == len(self.load_values):
+            return 0, []
+        value = self.load_values[i]
+        return value, sorted(self.by_load[value])
+
+    def max_duty(self):
+        if not self.load_values:
+            return 0, []
+        value = self.load_values[-1]
+        return value, sorted(self.by_load[value])
+
+    def summary(self):
+        total_faculty = len(self.loads)
+        no_duty_count = len(self.by_load.get(0, ()))
+        duty_assigned_count = total_faculty - no_duty_count
+        if total_faculty > 0:
+            pct_assigned = duty_assigned_count / total_faculty * 100
+            pct_no_duty = no_duty_count / total_faculty * 100
+            avg_duties = self.total / total_faculty
+        else:
+            pct_assigned = pct_no_duty = avg_duties = 0
+        return {
+            "Total Faculty": total_faculty,
+            "Faculty Assigned NO Duty": no_duty_count,
+            "Faculty Assigned SOME Duty": duty_assigned_count,
+            "Percentage Assigned Duty": f"{pct_assigned:.2f}%",
+            "Percentage No Duty": f"{pct_no_duty:.2f}%",
+            "Average Duty Load": f"{avg_duties:.2f}",
+            "Maximum Duty Assigned": self.max_duty()[0],
+            "Minimum Duty Assigned (Non-zero)": self.min_nonzero()[0],
+        }
+
+    def changed_cells(self):
+        """Heatmap cells touched by the moves so far: (name, semester) -> (before, after)."""
+        touched = {(src, sem) for sem, _, src, _ in self.history}
+        touched |= {(dst, sem) for sem, _, _, dst in self.history}
+        return {
+            key: (self.base_cells.get(key, 0), self.cells.get(key, 0))
+            for key in sorted(touched)
+            if self.base_cells.get(key, 0) != self.cells.get(key, 0)
+        }